@@ -13,13 +13,15 @@ class CrossBorderTerminal:
     Used for accounting for cross-border import and export of electricity.
     """
 
+    __slots__ = ("_capacity", "_net_import")
+
     def __init__(self, capacity: Power) -> None:
         """
         Arguments:
             capacity: Nominal maximum capacity of the terminal in MW.
         """
         self._capacity = capacity
-        self._net_import: Power = 0
+        self._net_import: Power = 0.0
 
     def export_at(self, power: Power) -> Power:
         """
@@ -33,8 +35,12 @@ class CrossBorderTerminal:
         """
         assert power >= 0
 
-        self._net_import = -min(self._capacity, power)
-        return -self._net_import
+        # A plain comparison is cheaper than a call to the min() builtin.
+        export_power = power if power < self._capacity else self._capacity
+        # Subtract from zero rather than negate, so that no export is recorded as
+        # a net import of 0.0 rather than -0.0.
+        self._net_import = 0.0 - export_power
+        return export_power
 
     def import_at(self, power: Power) -> Power:
         """
@@ -48,7 +54,7 @@ class CrossBorderTerminal:
         """
         assert power >= 0
 
-        self._net_import = min(self._capacity, power)
+        self._net_import = power if power < self._capacity else self._capacity
         return self._net_import
 
     @property
@@ -16,6 +16,8 @@ __all__ = [
 
 
 class SourceDispatcher:
+    __slots__ = ("_units",)
+
     def __init__(self, units: Sequence[DispatchableSource]) -> None:
         """
         Arguments:
@@ -24,7 +26,7 @@ class SourceDispatcher:
                 determines the merit order of dispatch, i.e. the first
                 source in the list is dispatched first whenever needed.
         """
-        self._units = units
+        self._units = tuple(units)
 
     def shut_down_all(self) -> None:
         for unit in self._units:
@@ -33,11 +35,17 @@ class SourceDispatcher:
     def dispatch_at(self, power: Power) -> Power:
         assert power >= 0
 
-        generation: Power = 0
+        units = iter(self._units)
+        generation: Power = 0.0
 
-        # Turn sources on until demand is satisfied.
-        for unit in self._units:
-            generation += unit.dispatch_at(max(0, power - generation))
+        # Turn sources on until demand is satisfied, then keep the rest idle.
+        for unit in units:
+            generation += unit.dispatch_at(power - generation)
+            if generation >= power:
+                break
+        # Continue with the units left over by the loop above.
+        for unit in units:
+            unit.idle()
 
         # Allow for some numeric error.
         # assert generation - power <= 1e-6
@@ -49,8 +57,10 @@ class SourceDispatcher:
 
 
 class StorageDispatcher:
+    __slots__ = ("_units",)
+
     def __init__(self, units: Sequence[EnergyStorage]) -> None:
-        self._units = units
+        self._units = tuple(units)
 
     def charge_at(self, power: Power) -> Power:
         """
@@ -59,9 +69,21 @@ class StorageDispatcher:
         """
         assert power >= 0
 
-        charging: Power = 0
-        for unit in self._units:
-            charging += unit.charge_at(max(0, power - charging))
+        # With nothing to charge, keep all units idle. Charging at zero power would
+        # record an output of -0.0 rather than 0.0.
+        if power == 0:
+            for unit in self._units:
+                unit.idle()
+            return 0.0
+
+        units = iter(self._units)
+        charging: Power = 0.0
+        for unit in units:
+            charging += unit.charge_at(power - charging)
+            if charging >= power:
+                break
+        for unit in units:
+            unit.idle()
 
         # Allow for some numeric error.
         assert charging - power <= 1e-6
@@ -74,9 +96,14 @@ class StorageDispatcher:
         """
         assert power >= 0
 
-        discharging: Power = 0
-        for unit in self._units:
-            discharging += unit.discharge_at(max(0, power - discharging))
+        units = iter(self._units)
+        discharging: Power = 0.0
+        for unit in units:
+            discharging += unit.discharge_at(power - discharging)
+            if discharging >= power:
+                break
+        for unit in units:
+            unit.idle()
 
         # Allow for some numeric error.
         assert discharging - power <= 1e-6
@@ -2,8 +2,10 @@
 Structures for working with clearly defined scenarios.
 """
 from __future__ import annotations
-from collections import defaultdict
-from typing import cast, List, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from math import isnan
+from typing import Iterable, List, Optional, Sequence
 
 from .cross_border import CrossBorderTerminal
 from .dispatch import (
@@ -18,15 +20,41 @@ from .source import (
 from .storage import EnergyStorage
 from .types import Energy, Power
 
-__all__ = ["Scenario", "ScenarioRun"]
+__all__ = ["Scenario", "ScenarioRun", "run_scenarios"]
+
+
+def _sum_negative(values: Iterable[Power]) -> Power:
+    """Return the sum of all negative values in a single pass."""
+    return sum(value for value in values if value < 0)
+
+
+def _sum_positive(values: Iterable[Power]) -> Power:
+    """Return the sum of all positive values in a single pass."""
+    return sum(value for value in values if value > 0)
 
 
 class ScenarioRun:
+    __slots__ = (
+        "_power_sources",
+        "_storage_units",
+        "_cross_border",
+        "_steps",
+        "_num_steps",
+        "_source_generation",
+        "_storage_output",
+        "_net_import",
+        "_shortage",
+        "_source_series",
+        "_storage_series",
+    )
+
     def __init__(
         self,
         power_sources: Sequence[PowerSource],
         storage_units: Sequence[EnergyStorage],
         cross_border: Optional[CrossBorderTerminal] = None,
+        *,
+        num_steps: int = 0,
     ) -> None:
         """
         Arguments:
@@ -35,59 +63,77 @@ class ScenarioRun:
                 in the grid.
             cross_border: Optional facility for cross-border export/import of
                 electric power.
+            num_steps: Expected number of time steps. The time series are
+                preallocated to this length and grow one step at a time
+                beyond it.
         """
+        assert num_steps >= 0
+
         self._power_sources = power_sources
         self._storage_units = storage_units
         self._cross_border = cross_border
 
         self._steps: int = 0
-        self._source_generation: dict[str, List[Power]] = defaultdict(list)
-        self._storage_output: dict[str, List[Power]] = defaultdict(list)
-        self._net_import: list[Power] = []
+        self._num_steps = num_steps
+        # Plain dicts, so that looking up an unknown name never adds a series.
+        self._source_generation: dict[str, List[Power]] = {
+            source.name: [0.0] * num_steps for source in power_sources
+        }
+        self._storage_output: dict[str, List[Power]] = {
+            storage.name: [0.0] * num_steps for storage in storage_units
+        }
+        # Net import is only recorded when there is a cross-border terminal.
+        self._net_import: list[Power] = [0.0] * num_steps if cross_border else []
         # Shortage (positive) or dump (negative).
-        self._shortage: list[Power] = []
+        self._shortage: list[Power] = [0.0] * num_steps
+
+        # Pair each object with its time series up front so that sweeping does
+        # not have to look the series up by name in every step.
+        self._source_series = tuple(
+            (source, self._source_generation[source.name]) for source in power_sources
+        )
+        self._storage_series = tuple(
+            (storage, self._storage_output[storage.name]) for storage in storage_units
+        )
 
     def compute_generation(self, source_name: str) -> Energy:
-        return sum(self._source_generation[source_name])
+        return sum(self._source_generation.get(source_name, ()))
 
     def compute_total_charging(self) -> Energy:
+        # Add up subtotals of each unit in turn. Summing all outputs in a single pass
+        # would round differently.
         return -1.0 * sum(
-            sum(output for output in self._storage_output[storage.name] if output < 0)
+            _sum_negative(self._storage_output[storage.name])
             for storage in self._storage_units
         )
 
     def compute_total_discharging(self) -> Energy:
         return sum(
-            sum(output for output in self._storage_output[storage.name] if output > 0)
+            _sum_positive(self._storage_output[storage.name])
             for storage in self._storage_units
         )
 
     def compute_total_dump(self) -> Energy:
-        return -sum(shortage for shortage in self._shortage if shortage < 0)
+        return -_sum_negative(self._shortage)
 
     def compute_total_export(self) -> Energy:
-        return -1.0 * sum(
-            net_import for net_import in self._net_import if net_import < 0
-        )
+        return -1.0 * _sum_negative(self._net_import)
 
     def compute_total_import(self) -> Energy:
-        return sum(net_import for net_import in self._net_import if net_import > 0)
+        return _sum_positive(self._net_import)
 
     def compute_total_shortage(self) -> Energy:
-        return sum(shortage for shortage in self._shortage if shortage > 0)
+        return _sum_positive(self._shortage)
 
     def count_charging_steps(self) -> int:
+        # Walk all storage series in lockstep, one tuple of outputs per step.
         return sum(
-            1
-            for step in range(self._steps)
-            if any(output[step] < 0 for output in self._storage_output.values())
+            1 for outputs in zip(*self._storage_output.values()) if min(outputs) < 0
         )
 
     def count_discharging_steps(self) -> int:
         return sum(
-            1
-            for step in range(self._steps)
-            if any(output[step] > 0 for output in self._storage_output.values())
+            1 for outputs in zip(*self._storage_output.values()) if max(outputs) > 0
         )
 
     def count_dump_steps(self) -> int:
@@ -98,7 +144,9 @@ class ScenarioRun:
 
     def count_generation_steps(self, source_name: str) -> int:
         return sum(
-            1 for generation in self._source_generation[source_name] if generation > 0
+            1
+            for generation in self._source_generation.get(source_name, ())
+            if generation > 0
         )
 
     def count_import_steps(self) -> int:
@@ -107,20 +155,69 @@ class ScenarioRun:
     def count_shortage_steps(self) -> int:
         return sum(1 for shortage in self._shortage if shortage > 0)
 
+    def get_source_generation(self, source_name: str) -> Optional[List[Power]]:
+        """
+        Return the time series of net generation of the given source in MW, or
+        `None` if there is no such source.
+        """
+        return self._source_generation.get(source_name)
+
+    def get_storage_output(self, storage_name: str) -> Optional[List[Power]]:
+        """
+        Return the time series of power output of the given storage unit in MW,
+        or `None` if there is no such unit.
+        """
+        return self._storage_output.get(storage_name)
+
+    @property
+    def net_import(self) -> List[Power]:
+        """Return the time series of net import in MW."""
+        return self._net_import
+
+    @property
+    def shortage(self) -> List[Power]:
+        """
+        Return the time series of shortage (positive) or dump (negative) in MW.
+        """
+        return self._shortage
+
     @property
     def steps(self) -> int:
         return self._steps
 
-    def sweep(self) -> None:
-        """Collect statistics from all registered objects."""
-        for source in self._power_sources:
-            self._source_generation[source.name].append(source.net_generation)
-        for storage in self._storage_units:
-            self._storage_output[storage.name].append(storage.output)
+    def sweep(self, shortage: Power = 0.0) -> None:
+        """
+        Collect statistics from all registered objects.
+
+        Arguments:
+            shortage: Electricity shortage in the current time step, i.e.
+                amount of load not met by the grid (positive) or excess
+                generation (negative).
+        """
+        step = self._steps
+        if step == self._num_steps:
+            self._grow()
+
+        for source, generation in self._source_series:
+            generation[step] = source.net_generation
+        for storage, output in self._storage_series:
+            output[step] = storage.output
         if self._cross_border:
-            self._net_import.append(self._cross_border.net_import)
+            self._net_import[step] = self._cross_border.net_import
+        self._shortage[step] = shortage
         self._steps += 1
 
+    def _grow(self) -> None:
+        """Extend all time series by a single time step."""
+        for series in self._source_generation.values():
+            series.append(0.0)
+        for series in self._storage_output.values():
+            series.append(0.0)
+        if self._cross_border:
+            self._net_import.append(0.0)
+        self._shortage.append(0.0)
+        self._num_steps += 1
+
 
 class Scenario:
     def __init__(
@@ -156,29 +253,50 @@ class Scenario:
 
         self._num_steps = len(load)
 
+        # Materialise the time series once. Validation below and the time loop then
+        # work with plain lists of floats regardless of the input type, e.g. NumPy
+        # arrays, whose scalars are much slower in plain Python arithmetic.
+        cap_factors = [list(map(float, ts)) for _, ts in intermittent_sources]
+
         # Check that the input has the correct dimensions.
-        if any(len(ts) != self._num_steps for _, ts in intermittent_sources):
+        if any(len(ts) != self._num_steps for ts in cap_factors):
             raise ValueError(
                 "Wrong dimensions of intermittent capacity factor time series. "
                 f"Expected {self._num_steps} cells for each source."
             )
 
         # Check that the capacity factor of intermittents is valid, i.e. between zero
-        # and one (inclusive), in each time step.
-        if any(not all(0 <= f <= 1 for f in ts) for _, ts in intermittent_sources):
+        # and one (inclusive), in each time step. The extremes are found in bulk,
+        # but NaNs compare false against anything and need to be checked for
+        # separately.
+        if any(
+            ts and (min(ts) < 0 or max(ts) > 1 or any(map(isnan, ts)))
+            for ts in cap_factors
+        ):
             raise ValueError(
                 "Invalid capacity factor value for intermittents. Make sure all "
                 "values are in the interval [0, 1]."
             )
 
-        self._load = load
+        self._load = list(map(float, load))
         self._baseloads = baseload_sources
         self._flexibles = flexible_sources
-        self._intermittents = intermittent_sources
+        self._intermittents = [
+            (source, ts) for (source, _), ts in zip(intermittent_sources, cap_factors)
+        ]
         self._storages = storage_units
         self._cross_border = cross_border
         self._losses = grid_losses
 
+        # All power sources in the grid in a fixed order for collecting statistics.
+        self._power_sources: tuple[PowerSource, ...] = tuple(
+            chain(
+                self._baseloads,
+                (source for source, _ in self._intermittents),
+                self._flexibles,
+            )
+        )
+
         self._flexibles_dispatcher = SourceDispatcher(self._flexibles)
         self._storage_dispatcher = StorageDispatcher(self._storages)
 
@@ -196,87 +314,124 @@ class Scenario:
             Object containing time series of electricity source utilisation,
                 storage utilisation, export/import statistics, etc.
         """
-        num_steps = len(self._load)
-
-        power_sources = (
-            cast(List[PowerSource], self._baseloads)
-            + cast(List[PowerSource], [source for source, _ in self._intermittents])
-            + cast(List[PowerSource], self._flexibles)
-        )
+        num_steps = self._num_steps
 
         stats = ScenarioRun(
-            power_sources=power_sources,
+            power_sources=self._power_sources,
             storage_units=self._storages,
             cross_border=self._cross_border,
+            num_steps=num_steps,
         )
 
+        # Baseload sources run at a constant utilisation throughout the scenario,
+        # so their net generation only needs to be computed once. The output of
+        # intermittent sources only depends on the capacity factor time series,
+        # so it can be precomputed for all time steps up front as well. Both are
+        # summed in the same order as when evaluated step by step, so that the
+        # results do not change in the last digit.
+        baseload_generation = sum(source.net_generation for source in self._baseloads)
+        intermittent_generation = [0.0] * num_steps
+        for source, cap_factor in self._intermittents:
+            net_generation_at = source.net_generation_at
+            for i, factor in enumerate(cap_factor):
+                intermittent_generation[i] += net_generation_at(factor)
+
+        # Balance of inflexible generation against gross consumption, i.e. net load
+        # plus grid losses, in each time step. Positive in case of surplus, negative
+        # in case of deficit.
+        load_factor = 1 + self._losses
+        balance = [
+            (baseload_generation + generation) - load * load_factor
+            for generation, load in zip(intermittent_generation, self._load)
+        ]
+
+        # Bind everything the time loop touches to local names so that each step
+        # avoids repeated attribute lookups.
+        intermittents = self._intermittents
+        cross_border = self._cross_border
+        flexibles = self._flexibles_dispatcher
+        dispatch_flexibles = flexibles.dispatch_at
+        shut_down_flexibles = flexibles.shut_down_all
+        charge_storage = self._storage_dispatcher.charge_at
+        discharge_storage = self._storage_dispatcher.discharge_at
+        sweep = stats.sweep
+
         for i in range(num_steps):
-            gross_consumption = self._load[i] * (1 + self._losses)
+            net_balance = balance[i]
 
             # Pass current utilisation down to the individual intermittent sources.
-            for source, cap_factor in self._intermittents:
+            for source, cap_factor in intermittents:
                 source.utilisation = cap_factor[i]
 
-            shortage = self._step(gross_consumption)
-            stats.sweep()
-            # FIXME: Make this more reasonable. Create some interface perhaps?
-            stats._shortage.append(shortage)  # pylint: disable=protected-access
+            # Dispatch whatever is necessary according to some rules. The resulting
+            # shortage is the amount of load not met by the grid (positive) or
+            # excess generation (negative).
+            if net_balance >= 0:
+                # Preemptively turn off flexible sources.
+                shut_down_flexibles()
+
+                surplus = net_balance + flexibles.net_generation
+
+                # Try charging storage if necessary.
+                charging = charge_storage(surplus)
+                # The subtraction may sometimes underflow due to numerical instability.
+                surplus = max(0.0, surplus - charging)
+
+                # If storage is full, try export.
+                export_power = cross_border.export_at(surplus) if cross_border else 0.0
+                # If export capacity is full, record dump/generation surplus.
+                # FIXME: What to do about this?
+                # Negate the difference rather than the clamp, which would turn an
+                # empty surplus into a negative zero.
+                shortage = min(0.0, export_power - surplus)
+            else:
+                deficit = -net_balance
+
+                # Try discharging as much storage as needed and possible.
+                discharging = discharge_storage(deficit)
+                # Clamp to hedge numerical instability.
+                deficit = max(0.0, deficit - discharging)
+
+                # If consumption still dominates, try turning on flexible sources in
+                # order of merit.
+                if deficit > 0:
+                    flexible_generation = dispatch_flexibles(deficit)
+                    # The subtraction may sometimes underflow due to numerical
+                    # instability.
+                    deficit = max(0.0, deficit - flexible_generation)
+                else:
+                    shut_down_flexibles()
+
+                # Try import if necessary.
+                import_power = cross_border.import_at(deficit) if cross_border else 0.0
+                # Record shortage if the previous failed to satisfy load.
+                # FIXME: What to do about this?
+                shortage = max(0.0, deficit - import_power)
+
+            sweep(shortage)
 
         return stats
 
-    def _step(self, consumption: Power) -> Power:
-        """
-        Returns:
-            Electricity shortage, i.e. amount of load not met by the grid (positive)
-                or excess generation (negative).
-        """
-        # Net power generated by inflexible sources (baseload + intermittents).
-        inflexible_generation = sum(
-            source.net_generation for source in self._baseloads
-        ) + sum(source.net_generation for source, _ in self._intermittents)
-
-        # Dispatch whatever is necessary according to some rules.
-        if inflexible_generation >= consumption:
-            # Preemptively turn off flexible sources.
-            self._flexibles_dispatcher.shut_down_all()
-
-            flexible_generation = self._flexibles_dispatcher.net_generation
-            surplus = inflexible_generation + flexible_generation - consumption
-
-            # Try charging storage if necessary.
-            charging = self._storage_dispatcher.charge_at(surplus)
-            # The subtraction may sometimes underflow due to numerical instability.
-            surplus = max(0, surplus - charging)
-
-            # If storage is full, try export.
-            export_power = (
-                self._cross_border.export_at(surplus) if self._cross_border else 0
-            )
-            # If export capacity is full, return dump/generation surplus.
-            # FIXME: What to do about this?
-            return -max(0, surplus - export_power)
-
-        assert inflexible_generation < consumption
-        deficit = consumption - inflexible_generation
-
-        # Try discharging as much storage as needed and possible.
-        discharging = self._storage_dispatcher.discharge_at(deficit)
-        # Clamp to hedge numerical instability.
-        deficit = max(0, deficit - discharging)
-
-        # If consumption still dominates, try turning on flexible sources in
-        # order of merit.
-        if deficit > 0:
-            flexible_generation = self._flexibles_dispatcher.dispatch_at(deficit)
-            # The subtraction may sometimes underflow due to numerical instability.
-            deficit = max(0, deficit - flexible_generation)
-        else:
-            self._flexibles_dispatcher.shut_down_all()
-
-        # Try import if necessary.
-        import_power = (
-            self._cross_border.import_at(deficit) if self._cross_border else 0
-        )
-        # Return shortage if the previous failed to satisfy load.
-        # FIXME: What to do about this?
-        return max(0, deficit - import_power)
+
+def run_scenarios(
+    scenarios: Iterable[Scenario], *, max_workers: Optional[int] = None
+) -> list[ScenarioRun]:
+    """
+    Run independent scenarios in parallel, each in a separate worker process.
+    This is useful for parameter sweeps where many variants of a scenario are
+    simulated.
+
+    Each scenario is copied to a worker process and run there, so the objects in
+    the grid of the original scenarios are left untouched. The statistics refer
+    to the copies of these objects.
+
+    Arguments:
+        scenarios: Scenarios to run.
+        max_workers: Maximum number of worker processes. Defaults to the number
+            of processors on the machine.
+
+    Returns:
+        Statistics of each scenario run, in the order of the given scenarios.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(Scenario.run, scenarios))
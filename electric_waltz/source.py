@@ -1,8 +1,6 @@
 """
 Objects and functions for electricity storage.
 """
-from dataclasses import dataclass
-
 from .types import Power
 
 __all__ = [
@@ -12,6 +10,11 @@ __all__ = [
     "ThermalPowerPlant",
 ]
 
+# Operating states of a thermal power plant.
+_SHUT_DOWN = 0
+_STARTING_UP = 1
+_RUNNING = 2
+
 
 class PowerSource:
     """
@@ -19,6 +22,16 @@ class PowerSource:
     grid. These are typically conventional or renewable power plants.
     """
 
+    __slots__ = (
+        "_name",
+        "_nominal_capacity",
+        "_self_consumption",
+        "_utilisation",
+        "_net_factor",
+        "_net_generation",
+        "_max_net_power",
+    )
+
     def __init__(
         self,
         name: str,
@@ -50,6 +63,20 @@ class PowerSource:
         self._self_consumption = self_consumption
         self._utilisation = utilisation
 
+        # Net generation only changes along with utilisation, so it is cached
+        # whenever the latter is updated.
+        self._net_factor = 1 - self_consumption
+        self._net_generation = utilisation * nominal * self._net_factor
+        # Net generation at full utilisation, which is constant for the source.
+        self._max_net_power = nominal * self._net_factor
+
+    def net_generation_at(self, utilisation: float) -> Power:
+        """
+        Return net power generation of the source in MW at the given utilisation,
+        without changing the source's current state.
+        """
+        return utilisation * self._nominal_capacity * self._net_factor
+
     @property
     def generation(self) -> Power:
         """
@@ -69,7 +96,7 @@ class PowerSource:
         Return net power generation of the source in MWh. This amount
         is equal to gross generation minus the source's self-consumption.
         """
-        return self.generation * (1 - self._self_consumption)
+        return self._net_generation
 
     @property
     def utilisation(self) -> float:
@@ -89,6 +116,7 @@ class PowerSource:
         """
         assert 0 <= value <= 1
         self._utilisation = value
+        self._net_generation = value * self._nominal_capacity * self._net_factor
 
 
 class NonDispatchableSource(PowerSource):
@@ -100,6 +128,8 @@ class NonDispatchableSource(PowerSource):
     no dispatch capabilities.
     """
 
+    __slots__ = ()
+
 
 class DispatchableSource(PowerSource):
     """
@@ -108,6 +138,8 @@ class DispatchableSource(PowerSource):
     hydroelectric, natural gas or biomass-fuelled power plants.
     """
 
+    __slots__ = ()
+
     def dispatch_at(self, power: Power) -> Power:
         """
         Request that the electricity source adjust its generation to at most
@@ -122,21 +154,34 @@ class DispatchableSource(PowerSource):
         """
         assert power >= 0
 
-        max_net_power = self._nominal_capacity * (1 - self._self_consumption)
-
         # Explicitly cap the capacity factor at 1.0. An overflow might sometimes occur
         # following some ordinary floating-point manipulations.
-        self._utilisation = min(power / max_net_power, 1)
+        self._utilisation = min(power / self._max_net_power, 1.0)
+        self._net_generation = (
+            self._utilisation * self._nominal_capacity * self._net_factor
+        )
 
-        assert 0 <= self._utilisation <= 1
-        return self.net_generation
+        if __debug__:
+            # Post-condition checks, skipped entirely under `python -O`.
+            assert 0 <= self._utilisation <= 1
+        return self._net_generation
+
+    def idle(self) -> None:
+        """
+        Request no generation from the source in the current time step. A plain
+        dispatchable source can stop generating at any time, so this is the same
+        as shutting it down. Sources with operating constraints, such as
+        `ThermalPowerPlant`, override this.
+        """
+        self.shut_down()
 
     def shut_down(self) -> None:
         """
         Request the power source to shut down, i.e. turn of all electricity
         generation.
         """
-        self._utilisation = 0
+        self._utilisation = 0.0
+        self._net_generation = 0.0
 
 
 class ThermalPowerPlant(DispatchableSource):
@@ -146,29 +191,15 @@ class ThermalPowerPlant(DispatchableSource):
     plants.
     """
 
-    class _State:
-        pass
-
-    @dataclass
-    class _ShutDown(_State):
-        downtime: int
-
-        def step(self) -> None:
-            self.downtime += 1
-
-    @dataclass
-    class _StartingUp(_State):
-        phase: int
-
-        def step(self) -> None:
-            self.phase += 1
-
-    @dataclass
-    class _Running(_State):
-        uptime: int
-
-        def step(self) -> None:
-            self.uptime += 1
+    __slots__ = (
+        "_min_load",
+        "_min_downtime",
+        "_min_uptime",
+        "_startup_time",
+        "_min_load_power",
+        "_state",
+        "_state_counter",
+    )
 
     def __init__(
         self,
@@ -209,9 +240,13 @@ class ThermalPowerPlant(DispatchableSource):
         self._min_uptime = min_uptime
         self._startup_time = startup_time
 
-        self._state: ThermalPowerPlant._State = ThermalPowerPlant._ShutDown(
-            min_downtime
-        )
+        # Minimum load in MW, which is compared against in every dispatch.
+        self._min_load_power = min_load * nominal
+
+        # Current operating state and the number of time steps spent in it, i.e.
+        # downtime when shut down, phase when starting up and uptime when running.
+        self._state = _SHUT_DOWN
+        self._state_counter = min_downtime
 
     def dispatch_at(self, power: Power) -> Power:
         """
@@ -227,35 +262,31 @@ class ThermalPowerPlant(DispatchableSource):
         """
         assert power >= 0
 
-        max_net_power = self._nominal_capacity * (1 - self._self_consumption)
         # Explicitly cap the capacity factor at 1.0. An overflow might sometimes occur
         # following some ordinary floating-point manipulations.
-        required_factor = min(power / max_net_power, 1)
+        required_factor = min(power / self._max_net_power, 1.0)
 
-        if self.is_shut_down:
+        state = self._state
+        if state == _SHUT_DOWN:
             assert self.net_generation == 0
-            assert isinstance(self._state, ThermalPowerPlant._ShutDown)
             if (
                 # We do not start firing up until the demand reaches at least
                 # the minimum required load.
-                power < self._min_load * self._nominal_capacity
+                power < self._min_load_power
                 # Check that the required cooldown period has passed.
-                or self._state.downtime < self._min_downtime
+                or self._state_counter < self._min_downtime
             ):
-                self._state.step()
+                self._state_counter += 1
             elif self._startup_time > 0:
-                self._start_up()
+                self._state, self._state_counter = _STARTING_UP, 0
             else:
-                self._run()
+                self._state, self._state_counter = _RUNNING, 1
                 self._utilisation = required_factor
-
-            assert 0 <= self._utilisation <= 1
-        elif self.is_starting_up:
+        elif state == _STARTING_UP:
             assert self._startup_time > 0
-            assert isinstance(self._state, ThermalPowerPlant._StartingUp)
-            if self._state.phase == self._startup_time:
-                self._run()
-                if power < self._min_load * self._nominal_capacity:
+            if self._state_counter == self._startup_time:
+                self._state, self._state_counter = _RUNNING, 1
+                if power < self._min_load_power:
                     if self._min_uptime == 0:
                         self.shut_down()
                     else:
@@ -263,52 +294,52 @@ class ThermalPowerPlant(DispatchableSource):
                 else:
                     self._utilisation = required_factor
             else:
-                self._state.step()
+                self._state_counter += 1
                 self._utilisation = (
-                    self._state.phase
+                    self._state_counter
                     / self._startup_time
                     * self._min_load
-                    / (1 - self._self_consumption)
+                    / self._net_factor
                 )
         else:
-            assert isinstance(self._state, ThermalPowerPlant._Running)
+            assert state == _RUNNING
 
-            self._state.step()
+            self._state_counter += 1
 
-            if power < self._min_load * self._nominal_capacity:
-                if self._state.uptime < self._min_uptime:
+            if power < self._min_load_power:
+                if self._state_counter < self._min_uptime:
                     self._utilisation = self._min_load
                 else:
                     self.shut_down()
             else:
                 self._utilisation = required_factor
 
-        assert 0 <= self._utilisation <= 1
-        return self.net_generation
+        if __debug__:
+            # Post-condition checks, skipped entirely under `python -O`.
+            assert 0 <= self._utilisation <= 1
+        self._net_generation = (
+            self._utilisation * self._nominal_capacity * self._net_factor
+        )
+        return self._net_generation
+
+    def idle(self) -> None:
+        # The plant may be required to keep running or cooling down even when
+        # no power is requested from it.
+        self.dispatch_at(0.0)
 
     @property
     def is_shut_down(self) -> bool:
-        return isinstance(self._state, ThermalPowerPlant._ShutDown)
+        return self._state == _SHUT_DOWN
 
     @property
     def is_starting_up(self) -> bool:
-        return isinstance(self._state, ThermalPowerPlant._StartingUp)
-
-    def _run(self) -> None:
-        self._state = ThermalPowerPlant._Running(uptime=1)
+        return self._state == _STARTING_UP
 
     def shut_down(self) -> None:
-        if isinstance(self._state, ThermalPowerPlant._ShutDown):
-            self._state.downtime += 1
-            self._utilisation = 0.0
-        elif isinstance(self._state, ThermalPowerPlant._StartingUp):
-            # TODO: Handle this better.
-            self._state = ThermalPowerPlant._ShutDown(1)
-            self._utilisation = 0.0
+        if self._state == _SHUT_DOWN:
+            self._state_counter += 1
         else:
-            assert isinstance(self._state, ThermalPowerPlant._Running)
-            self._state = ThermalPowerPlant._ShutDown(1)
-            self._utilisation = 0.0
-
-    def _start_up(self) -> None:
-        self._state = ThermalPowerPlant._StartingUp(phase=0)
+            # TODO: Handle shutting down while starting up better.
+            self._state, self._state_counter = _SHUT_DOWN, 1
+        self._utilisation = 0.0
+        self._net_generation = 0.0
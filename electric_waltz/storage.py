@@ -16,6 +16,15 @@ class EnergyStorage:
     kind of storage.
     """
 
+    __slots__ = (
+        "_name",
+        "_nominal_capacity",
+        "_max_storage",
+        "_efficiency",
+        "_current_energy",
+        "_current_output",
+    )
+
     def __init__(
         self,
         name: str,
@@ -61,7 +70,9 @@ class EnergyStorage:
         # Effective charging power is limited by the lest of nominal capacity and the
         # remaining storage capacity. Note that we may treat MW = MWh as we assume
         # hourly steps.
-        charging = min(power, self._nominal_capacity, self.remaining_capacity)
+        charging = min(
+            power, self._nominal_capacity, self._max_storage - self._current_energy
+        )
         self._current_energy += self._efficiency * charging
         self._current_output = -charging
 
@@ -91,6 +102,14 @@ class EnergyStorage:
         assert self._current_energy >= 0
         return discharging
 
+    def idle(self) -> None:
+        """
+        Keep the storage unit idle in the current time step, i.e. neither charge
+        nor discharge it. This is equivalent to charging or discharging at zero
+        power.
+        """
+        self._current_output = 0.0
+
     @property
     def name(self) -> str:
         """Return the storage aggregate's textual identifier."""
@@ -3,6 +3,8 @@ Type definitions and aliases for standard physical units.
 """
 __all__ = ["Energy", "Power"]
 
-# TODO: Should this be a type alias or a NewType?
+# These are deliberately plain aliases rather than NewTypes, so that values of
+# these types are ordinary floats both to type checkers and at run time. They
+# enter floating-point arithmetic in every step of a simulation.
 Energy = float
 Power = float
@@ -2,10 +2,9 @@ from __future__ import annotations
 import argparse
 import csv
 import time
-from typing import cast
 
 from pandas import DataFrame, read_csv
-from ruamel.yaml import YAML
+import yaml
 
 from electric_waltz.cross_border import CrossBorderTerminal
 from electric_waltz.dispatch import SourceDispatcher, StorageDispatcher
@@ -19,22 +18,42 @@ from electric_waltz.source import (
 from electric_waltz.storage import EnergyStorage
 from electric_waltz.types import Energy, Power
 
+# Prefer the libyaml-backed loader, which is much faster than the pure Python one.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def make_non_dispatchable(kind: str, plants) -> NonDispatchableSource:
+    """
+    Create an object for non-dispatchable power plant of given kind from the
+    supplied ``plants`` section of the configuration.
+    """
+    return NonDispatchableSource(
+        name=kind,
+        nominal=plants["installed"][kind],
+        self_consumption=plants["self_consumption"][kind],
+    )
+
+
+def make_dispatchable(kind: str, plants) -> DispatchableSource:
+    """
+    Create an object for dispatchable power plant of given kind from the
+    supplied ``plants`` section of the configuration.
+    """
+    return DispatchableSource(
+        name=kind,
+        nominal=plants["installed"][kind],
+        self_consumption=plants["self_consumption"][kind],
+    )
+
 
 def make_power_plant(kind: str, config) -> PowerSource:
     """
     Create an object for power plant of given kind from the supplied
     configuration.
     """
-    nominal_capacity = config["plants"]["installed"][kind]
-    self_consumption = config["plants"]["self_consumption"][kind]
-
     if kind in ("nuclear", "pv", "wind"):
-        return NonDispatchableSource(
-            name=kind, nominal=nominal_capacity, self_consumption=self_consumption
-        )
-    return DispatchableSource(
-        name=kind, nominal=nominal_capacity, self_consumption=self_consumption
-    )
+        return make_non_dispatchable(kind, config["plants"])
+    return make_dispatchable(kind, config["plants"])
 
 
 def make_storage(kind: str, config) -> EnergyStorage:
@@ -42,20 +61,27 @@ def make_storage(kind: str, config) -> EnergyStorage:
     Create an object for storage aggregate of given kind from the supplied
     configuration.
     """
-    nominal_capacity = config["storage"]["installed"][kind]
-    max_energy = config["storage"]["max_energy"][kind]
-    efficiency = config["storage"]["efficiency"][kind]
-
+    storage = config["storage"]
     return EnergyStorage(
         name=kind,
-        nominal=nominal_capacity,
-        max_storage=max_energy,
-        efficiency=efficiency,
+        nominal=storage["installed"][kind],
+        max_storage=storage["max_energy"][kind],
+        efficiency=storage["efficiency"][kind],
     )
 
 
 def main(args: argparse.Namespace) -> None:
-    world = read_csv(args.world_file)
+    # Only parse the columns the model needs, straight into floating point, so
+    # that the datetime and calendar columns are never converted.
+    columns = {"load", "solar_util", "wind_util"}
+    if args.year is not None:
+        columns.add("year")
+    world = read_csv(
+        args.world_file,
+        engine="c",
+        usecols=lambda column: column in columns,
+        dtype={"load": float, "solar_util": float, "wind_util": float, "year": int},
+    )
 
     if "load" not in world or "solar_util" not in world or "wind_util" not in world:
         raise ValueError(
@@ -63,6 +89,12 @@ def main(args: argparse.Namespace) -> None:
             "‘solar_util’ and ‘wind_util’."
         )
 
+    # Extract the input time series as arrays once, so that the arithmetic below
+    # is vectorised and the model never has to index into the data frame.
+    load = world["load"].to_numpy(dtype=float)
+    solar_util = world["solar_util"].to_numpy(dtype=float)
+    wind_util = world["wind_util"].to_numpy(dtype=float)
+
     if args.year is not None:
         if "year" not in world:
             raise ValueError(
@@ -70,34 +102,39 @@ def main(args: argparse.Namespace) -> None:
                 "by year is used."
             )
 
-        world = world[world["year"] == args.year].reset_index(drop=True)
-        if world.empty:
+        selected = world["year"].to_numpy() == args.year
+        if not selected.any():
             raise ValueError(
                 "The world state CSV file must contain at least one row with year equal to "
                 f"{args.year}."
             )
+        load = load[selected]
+        solar_util = solar_util[selected]
+        wind_util = wind_util[selected]
 
     with open(args.config_file, encoding="utf-8") as config_file:
-        config = YAML(typ="safe").load(config_file)
+        config = yaml.load(config_file, Loader=SafeLoader)
 
     if "load_multiplier" in config["consumption"]:
         load_multiplier = float(config["consumption"]["load_multiplier"])
-        world.load *= load_multiplier
+        load *= load_multiplier
 
     grid_losses: float = (
         config["consumption"]["transmission_loss"]
         + config["consumption"]["distribution_loss"]
     )
 
+    plants = config["plants"]
+
     # Inflexible power plants.
-    nuclear = cast(NonDispatchableSource, make_power_plant("nuclear", config))
-    pv = cast(NonDispatchableSource, make_power_plant("pv", config))
-    wind = cast(NonDispatchableSource, make_power_plant("wind", config))
+    nuclear = make_non_dispatchable("nuclear", plants)
+    pv = make_non_dispatchable("pv", plants)
+    wind = make_non_dispatchable("wind", plants)
 
     # Flexible power plants.
-    # hydro = cast(DispatchableSource, make_power_plant("hydro", config))
-    # biomass = cast(DispatchableSource, make_power_plant("biomass", config))
-    gas = cast(DispatchableSource, make_power_plant("gas", config))
+    # hydro = make_dispatchable("hydro", plants)
+    # biomass = make_dispatchable("biomass", plants)
+    gas = make_dispatchable("gas", plants)
     coal = ThermalPowerPlant(
         name="coal",
         nominal=5000,
@@ -118,11 +155,11 @@ def main(args: argparse.Namespace) -> None:
 
     # Construct the scenario object and run the simulation.
     scenario = Scenario(
-        load=world.load,
+        load=load,
         baseload_sources=[nuclear],
         intermittent_sources=[
-            (pv, world.solar_util),
-            (wind, world.wind_util),
+            (pv, solar_util),
+            (wind, wind_util),
         ],
         # flexible_sources=[hydro, biomass, gas],
         flexible_sources=[coal, gas],
@@ -135,17 +172,22 @@ def main(args: argparse.Namespace) -> None:
     stats = scenario.run()
     finish_time = time.perf_counter_ns()
 
-    total_consumption = sum(world.load)
+    total_consumption = load.sum()
+    # Sum up each source's generation once, as it is both totalled and printed.
+    generation = {
+        source.name: stats.compute_generation(source.name)
+        for source in (nuclear, pv, wind, coal, gas)
+    }
     total_flexible_generation = (
-        stats.compute_generation("gas")
-        # stats.compute_generation("hydro")
-        # + stats.compute_generation("biomass")
-        # + stats.compute_generation("gas")
+        generation["gas"]
+        # generation["hydro"]
+        # + generation["biomass"]
+        # + generation["gas"]
     )
     total_inflexible_generation = (
-        stats.compute_generation("nuclear")
-        + stats.compute_generation("pv")
-        + stats.compute_generation("wind")
+        generation["nuclear"]
+        + generation["pv"]
+        + generation["wind"]
     )
     total_generation = total_flexible_generation + total_inflexible_generation
 
@@ -167,14 +209,14 @@ def main(args: argparse.Namespace) -> None:
 
     print(f"Total net generation         {total_generation:12,.0f} MWh")
     print(f"├─ Total inflexible          {total_inflexible_generation:12,.0f}")
-    print("│  ├─ Nuclear                {:12,.0f}".format(stats.compute_generation("nuclear")))
-    print("│  ├─ Solar PV               {:12,.0f}".format(stats.compute_generation("pv")))
-    print("│  └─ On-shore wind          {:12,.0f}".format(stats.compute_generation("wind")))
+    print("│  ├─ Nuclear                {:12,.0f}".format(generation["nuclear"]))
+    print("│  ├─ Solar PV               {:12,.0f}".format(generation["pv"]))
+    print("│  └─ On-shore wind          {:12,.0f}".format(generation["wind"]))
     print(f"└─ Total flexible            {total_flexible_generation:12,.0f}")
-    # print("   ├─ Hydro                  {:12,.0f}".format(stats.compute_generation("hydro")))
-    # print("   ├─ Biomass                {:12,.0f}".format(stats.compute_generation("biomass")))
-    print("   ├─ Coal                   {:12,.0f}".format(stats.compute_generation("coal")))
-    print("   └─ Natural gas            {:12,.0f}".format(stats.compute_generation("gas")))
+    # print("   ├─ Hydro                  {:12,.0f}".format(generation["hydro"]))
+    # print("   ├─ Biomass                {:12,.0f}".format(generation["biomass"]))
+    print("   ├─ Coal                   {:12,.0f}".format(generation["coal"]))
+    print("   └─ Natural gas            {:12,.0f}".format(generation["gas"]))
 
     print(
         f"\nTotal charging consumption   {total_charging:12,.0f} MWh "
@@ -208,18 +250,18 @@ def main(args: argparse.Namespace) -> None:
     if args.output_file is not None:
         model_output = DataFrame(
             data={
-                "nuclear": stats._source_generation["nuclear"],
-                "pv": stats._source_generation["pv"],
-                "wind": stats._source_generation["wind"],
-                # "biomass": stats._source_generation["biomass"],
-                # "hydro": stats._source_generation["hydro"],
-                "coal": stats._source_generation["coal"],
-                "gas": stats._source_generation["gas"],
-                "pumped": stats._storage_output["pumped"],
-                "battery": stats._storage_output["battery"],
-                "p2g": stats._storage_output["p2g"],
-                "import": stats._net_import,
-                "shortage": stats._shortage,
+                "nuclear": stats.get_source_generation("nuclear"),
+                "pv": stats.get_source_generation("pv"),
+                "wind": stats.get_source_generation("wind"),
+                # "biomass": stats.get_source_generation("biomass"),
+                # "hydro": stats.get_source_generation("hydro"),
+                "coal": stats.get_source_generation("coal"),
+                "gas": stats.get_source_generation("gas"),
+                "pumped": stats.get_storage_output("pumped"),
+                "battery": stats.get_storage_output("battery"),
+                "p2g": stats.get_storage_output("p2g"),
+                "import": stats.net_import,
+                "shortage": stats.shortage,
             }
         )
         model_output.to_csv(args.output_file, index_label="ix")
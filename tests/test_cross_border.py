@@ -1,3 +1,4 @@
+import math
 from unittest import TestCase
 
 from electric_waltz.cross_border import CrossBorderTerminal
@@ -14,6 +15,12 @@ class CrossBorderTerminalTestCase(TestCase):
         self.assertEqual(export_power, 0)
         self.assertEqual(term.net_import, 0)
 
+    def test_export_at_zero_float(self):
+        term = CrossBorderTerminal(capacity=5000)
+        term.export_at(0.0)
+        # No export must not be recorded as a negative zero.
+        self.assertEqual(math.copysign(1.0, term.net_import), 1.0)
+
     def test_export_at_some(self):
         term = CrossBorderTerminal(capacity=5000)
         export_power = term.export_at(1000)
@@ -2,13 +2,20 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from electric_waltz.dispatch import SourceDispatcher, StorageDispatcher
+from electric_waltz.source import DispatchableSource
+from electric_waltz.storage import EnergyStorage
 
 
 class SourceDispatcherTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.biomass = Mock(spec=DispatchableSource)
+        cls.ccgt = Mock(spec=DispatchableSource)
+        cls.hydro = Mock(spec=DispatchableSource)
+
     def setUp(self):
-        self.biomass = Mock()
-        self.ccgt = Mock()
-        self.hydro = Mock()
+        for unit in (self.biomass, self.ccgt, self.hydro):
+            unit.reset_mock(return_value=True, side_effect=True)
 
     def test_init(self):
         dispatcher = SourceDispatcher([self.hydro, self.biomass, self.ccgt])
@@ -33,8 +40,10 @@ class SourceDispatcherTestCase(TestCase):
         self.assertEqual(generation, 0)
 
         self.hydro.dispatch_at.assert_called_once_with(0)
-        self.biomass.dispatch_at.assert_called_once_with(0)
-        self.ccgt.dispatch_at.assert_called_once_with(0)
+        self.biomass.dispatch_at.assert_not_called()
+        self.biomass.idle.assert_called_once()
+        self.ccgt.dispatch_at.assert_not_called()
+        self.ccgt.idle.assert_called_once()
 
     def test_dispatch_one_unit(self):
         dispatcher = SourceDispatcher([self.hydro, self.biomass, self.ccgt])
@@ -47,8 +56,10 @@ class SourceDispatcherTestCase(TestCase):
         self.assertEqual(generation, 800)
 
         self.hydro.dispatch_at.assert_called_once_with(800)
-        self.biomass.dispatch_at.assert_called_once_with(0)
-        self.ccgt.dispatch_at.assert_called_once_with(0)
+        self.biomass.dispatch_at.assert_not_called()
+        self.biomass.idle.assert_called_once()
+        self.ccgt.dispatch_at.assert_not_called()
+        self.ccgt.idle.assert_called_once()
 
     def test_dispatch_all_units(self):
         dispatcher = SourceDispatcher([self.hydro, self.biomass, self.ccgt])
@@ -80,10 +91,15 @@ class SourceDispatcherTestCase(TestCase):
 
 
 class StorageDispatcherTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.battery = Mock(spec=EnergyStorage)
+        cls.pumped = Mock(spec=EnergyStorage)
+        cls.p2g = Mock(spec=EnergyStorage)
+
     def setUp(self):
-        self.battery = Mock()
-        self.pumped = Mock()
-        self.p2g = Mock()
+        for unit in (self.battery, self.pumped, self.p2g):
+            unit.reset_mock(return_value=True, side_effect=True)
 
     def test_init(self):
         dispatcher = StorageDispatcher([self.pumped, self.battery, self.p2g])
@@ -98,9 +114,9 @@ class StorageDispatcherTestCase(TestCase):
         charging = dispatcher.charge_at(0)
         self.assertEqual(charging, 0)
 
-        self.pumped.charge_at.assert_called_once_with(0)
-        self.battery.charge_at.assert_called_once_with(0)
-        self.p2g.charge_at.assert_called_once_with(0)
+        for unit in (self.pumped, self.battery, self.p2g):
+            unit.charge_at.assert_not_called()
+            unit.idle.assert_called_once()
 
     def test_charge_one_unit(self):
         dispatcher = StorageDispatcher([self.pumped, self.battery, self.p2g])
@@ -113,8 +129,10 @@ class StorageDispatcherTestCase(TestCase):
         self.assertEqual(charging, 500)
 
         self.pumped.charge_at.assert_called_once_with(500)
-        self.battery.charge_at.assert_called_once_with(0)
-        self.p2g.charge_at.assert_called_once_with(0)
+        self.battery.charge_at.assert_not_called()
+        self.battery.idle.assert_called_once()
+        self.p2g.charge_at.assert_not_called()
+        self.p2g.idle.assert_called_once()
 
     def test_charge_all_units(self):
         dispatcher = StorageDispatcher([self.pumped, self.battery, self.p2g])
@@ -155,8 +173,10 @@ class StorageDispatcherTestCase(TestCase):
         self.assertEqual(charging, 0)
 
         self.pumped.discharge_at.assert_called_once_with(0)
-        self.battery.discharge_at.assert_called_once_with(0)
-        self.p2g.discharge_at.assert_called_once_with(0)
+        self.battery.discharge_at.assert_not_called()
+        self.battery.idle.assert_called_once()
+        self.p2g.discharge_at.assert_not_called()
+        self.p2g.idle.assert_called_once()
 
     def test_discharge_one_unit(self):
         dispatcher = StorageDispatcher([self.pumped, self.battery, self.p2g])
@@ -169,8 +189,10 @@ class StorageDispatcherTestCase(TestCase):
         self.assertEqual(charging, 500)
 
         self.pumped.discharge_at.assert_called_once_with(500)
-        self.battery.discharge_at.assert_called_once_with(0)
-        self.p2g.discharge_at.assert_called_once_with(0)
+        self.battery.discharge_at.assert_not_called()
+        self.battery.idle.assert_called_once()
+        self.p2g.discharge_at.assert_not_called()
+        self.p2g.idle.assert_called_once()
 
     def test_discharge_all_units(self):
         dispatcher = StorageDispatcher([self.pumped, self.battery, self.p2g])
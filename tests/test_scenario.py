@@ -1,15 +1,24 @@
+import math
+from types import SimpleNamespace
 from unittest import TestCase
-from unittest.mock import Mock, PropertyMock
+from unittest.mock import Mock, PropertyMock, patch
 
-from electric_waltz.scenario import Scenario, ScenarioRun
+from electric_waltz.cross_border import CrossBorderTerminal
+from electric_waltz.scenario import Scenario, ScenarioRun, run_scenarios
+from electric_waltz.source import (
+    DispatchableSource,
+    NonDispatchableSource,
+    ThermalPowerPlant,
+)
+from electric_waltz.storage import EnergyStorage
 
 
 class ScenarioTestCase(TestCase):
     def setUp(self):
-        self.battery = Mock()
-        self.nuclear = Mock()
-        self.peaker = Mock()
-        self.pv = Mock()
+        self.battery = Mock(spec=EnergyStorage)
+        self.nuclear = Mock(spec=NonDispatchableSource)
+        self.peaker = Mock(spec=DispatchableSource)
+        self.pv = Mock(spec=NonDispatchableSource)
 
     def test_init(self):
         scenario = Scenario(
@@ -59,28 +68,147 @@ class ScenarioTestCase(TestCase):
                 storage_units=[],
             )
 
+    def test_init_nan_cap_factor(self):
+        with self.assertRaises(ValueError):
+            scenario = Scenario(
+                load=[111, 132, 145],
+                baseload_sources=[],
+                flexible_sources=[],
+                intermittent_sources=[
+                    (self.pv, [0, float("nan"), .5]),
+                ],
+                storage_units=[],
+            )
+
+    def test_run_inflexible_generation(self):
+        # Without any flexibility in the grid, the shortage is simply the gross
+        # consumption less the inflexible generation.
+        scenario = Scenario(
+            load=[10000, 25000],
+            baseload_sources=[
+                NonDispatchableSource("nuclear", 2000, self_consumption=0.06),
+            ],
+            flexible_sources=[],
+            intermittent_sources=[
+                (
+                    NonDispatchableSource("pv", 23058, self_consumption=0.01),
+                    [0.47, 0.47],
+                ),
+                (
+                    NonDispatchableSource("wind", 8777, self_consumption=0.03),
+                    [0.58, 0.58],
+                ),
+            ],
+            storage_units=[],
+            grid_losses=0.05,
+        )
+
+        run = scenario.run()
+
+        # Inflexible generation is summed as baseload plus the sum of all
+        # intermittents, each computed as utilisation * nominal * net factor.
+        # These values are chosen so that any other order changes the last digit.
+        inflexible = 1 * 2000 * (1 - 0.06) + (
+            0.47 * 23058 * (1 - 0.01) + 0.58 * 8777 * (1 - 0.03)
+        )
+        self.assertEqual(
+            run.shortage, [10000 * 1.05 - inflexible, 25000 * 1.05 - inflexible]
+        )
+
+    def test_run_balanced_step(self):
+        # In an exactly balanced step, storage is asked to charge at zero power,
+        # which must be recorded as a positive zero rather than a negative one.
+        scenario = Scenario(
+            load=[0, 100],
+            baseload_sources=[NonDispatchableSource("nuclear", 100)],
+            flexible_sources=[],
+            intermittent_sources=[],
+            storage_units=[
+                EnergyStorage("battery", 10, 100),
+                EnergyStorage("pumped", 10, 100),
+            ],
+        )
+
+        run = scenario.run()
+
+        for name in ("battery", "pumped"):
+            with self.subTest(name=name):
+                output = run.get_storage_output(name)
+                self.assertEqual(output, [-10, 0])
+                self.assertEqual(math.copysign(1.0, output[1]), 1.0)
+        self.assertEqual(math.copysign(1.0, run.shortage[1]), 1.0)
+
+    def test_run(self):
+        scenario = Scenario(
+            load=[1500, 1700, 1100, 1700, 2500, 1300],
+            baseload_sources=[NonDispatchableSource("nuclear", 1000)],
+            flexible_sources=[
+                ThermalPowerPlant("coal", 400, min_load=0.5),
+                DispatchableSource("gas", 200),
+            ],
+            intermittent_sources=[
+                (NonDispatchableSource("pv", 1000), [1, 0.5, 0, 0, 0, 0.5]),
+            ],
+            storage_units=[EnergyStorage("battery", 200, 400, efficiency=0.5)],
+            cross_border=CrossBorderTerminal(capacity=100),
+        )
+
+        run = scenario.run()
+
+        # 1. Surplus of 500 MW charges the battery at nominal, is exported up to
+        #    the capacity of the terminal and the rest is dumped.
+        # 2. Deficit of 200 MW discharges the 100 MWh stored in the battery. The
+        #    rest is below the minimum load of coal and covered by gas.
+        # 3. Deficit of 100 MW is covered by gas with the battery empty.
+        # 4. Deficit of 700 MW dispatches coal and gas in full and imports the rest.
+        # 5. Deficit of 1500 MW leaves a shortage after import.
+        # 6. Surplus of 200 MW shuts down the flexibles and charges the battery.
+        self.assertEqual(run.steps, 6)
+        self.assertEqual(
+            run.get_source_generation("nuclear"), [1000, 1000, 1000, 1000, 1000, 1000]
+        )
+        self.assertEqual(run.get_source_generation("pv"), [1000, 500, 0, 0, 0, 500])
+        self.assertEqual(run.get_source_generation("coal"), [0, 0, 0, 400, 400, 0])
+        self.assertEqual(run.get_source_generation("gas"), [0, 100, 100, 200, 200, 0])
+        self.assertEqual(run.get_storage_output("battery"), [-200, 100, 0, 0, 0, -200])
+        self.assertEqual(run.net_import, [-100, 0, 0, 100, 100, 0])
+        self.assertEqual(run.shortage, [-200, 0, 0, 0, 800, 0])
+        self.assertEqual(run.compute_total_export(), 100)
+        self.assertEqual(run.compute_total_import(), 200)
+        self.assertEqual(run.compute_total_dump(), 200)
+        self.assertEqual(run.compute_total_shortage(), 800)
+
 
 class ScenarioRunTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.battery = Mock(spec=EnergyStorage)
+        cls.nuclear = Mock(spec=NonDispatchableSource)
+        cls.peaker = Mock(spec=DispatchableSource)
+        cls.pv = Mock(spec=NonDispatchableSource)
+
+        type(cls.battery).name = "battery"
+        type(cls.nuclear).name = "nuclear"
+        type(cls.peaker).name = "peaker"
+        type(cls.pv).name = "pv"
+
     def setUp(self):
-        self.battery = Mock()
-        self.nuclear = Mock()
-        self.peaker = Mock()
-        self.pv = Mock()
-
-        self.out_battery = PropertyMock()
-        self.ng_nuclear = PropertyMock()
-        self.ng_peaker = PropertyMock()
-        self.ng_pv = PropertyMock()
-
-        type(self.battery).output = self.out_battery
-        type(self.nuclear).net_generation = self.ng_nuclear
-        type(self.peaker).net_generation = self.ng_peaker
-        type(self.pv).net_generation = self.ng_pv
-
-        type(self.battery).name = PropertyMock(return_value="battery")
-        type(self.nuclear).name = PropertyMock(return_value="nuclear")
-        type(self.peaker).name = PropertyMock(return_value="peaker")
-        type(self.pv).name = PropertyMock(return_value="pv")
+        for mock in (self.battery, self.nuclear, self.peaker, self.pv):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+        # Property mocks are descriptors, so they cannot be shared as class
+        # attributes of the test case and are patched in for each test instead.
+        self.out_battery = self._patch_property(self.battery, "output")
+        self.ng_nuclear = self._patch_property(self.nuclear, "net_generation")
+        self.ng_peaker = self._patch_property(self.peaker, "net_generation")
+        self.ng_pv = self._patch_property(self.pv, "net_generation")
+
+    def _patch_property(self, mock, attribute):
+        patcher = patch.object(
+            type(mock), attribute, new_callable=PropertyMock, create=True
+        )
+        self.addCleanup(patcher.stop)
+        return patcher.start()
 
     def test_init(self):
         run = ScenarioRun([], [])
@@ -110,25 +238,107 @@ class ScenarioRunTestCase(TestCase):
         self.ng_peaker.assert_called_once()
         self.out_battery.assert_called_once()
 
-    def test_compute_total_charging(self):
+    def test_sweep_preallocated(self):
         run = ScenarioRun(
             power_sources=[self.nuclear, self.pv, self.peaker],
-            storage_units=[self.battery]
+            storage_units=[self.battery],
+            num_steps=2,
         )
 
         self.ng_nuclear.return_value = 100
-        self.ng_pv.return_value = 50
+        self.ng_pv.side_effect = [50, 0, 40]
         self.ng_peaker.return_value = 0
-        self.out_battery.side_effect = [0, -10, 5]
+        self.out_battery.return_value = 0
 
-        run.sweep()
-        run.sweep()
-        run.sweep()
+        run.sweep(10)
+        run.sweep(0)
+        run.sweep(-5)
 
         self.assertEqual(run.steps, 3)
-        self.assertEqual(run.compute_total_charging(), 10)
+        self.assertEqual(run.compute_generation("nuclear"), 300)
+        self.assertEqual(run.compute_generation("pv"), 90)
+        self.assertEqual(run.compute_total_shortage(), 10)
+        self.assertEqual(run.compute_total_dump(), 5)
+
+    def test_get_series(self):
+        nuclear = SimpleNamespace(name="nuclear", net_generation=100)
+        pv = SimpleNamespace(name="pv", net_generation=50)
+        battery = SimpleNamespace(name="battery", output=-20)
+        terminal = SimpleNamespace(net_import=0)
+        run = ScenarioRun(
+            power_sources=[nuclear, pv],
+            storage_units=[battery],
+            cross_border=terminal,
+            num_steps=2,
+        )
 
-    def test_compute_total_discharging(self):
+        run.sweep(10)
+        pv.net_generation = 0
+        battery.output = 10
+        terminal.net_import = 30
+        run.sweep(-5)
+
+        self.assertEqual(run.get_source_generation("nuclear"), [100, 100])
+        self.assertEqual(run.get_source_generation("pv"), [50, 0])
+        self.assertEqual(run.get_storage_output("battery"), [-20, 10])
+        self.assertEqual(run.net_import, [0, 30])
+        self.assertEqual(run.shortage, [10, -5])
+        self.assertIsNone(run.get_source_generation("coal"))
+        self.assertIsNone(run.get_storage_output("p2g"))
+
+    def test_unknown_name(self):
+        nuclear = SimpleNamespace(name="nuclear", net_generation=100)
+        battery = SimpleNamespace(name="battery", output=-20)
+        run = ScenarioRun(power_sources=[nuclear], storage_units=[battery])
+
+        self.assertEqual(run.compute_generation("coal"), 0)
+        self.assertEqual(run.count_generation_steps("coal"), 0)
+        run.sweep()
+        run.sweep()
+
+        # Querying an unknown name must not add a series for it.
+        self.assertIsNone(run.get_source_generation("coal"))
+        self.assertEqual(run.get_source_generation("nuclear"), [100, 100])
+        self.assertEqual(run.count_charging_steps(), 2)
+
+    def test_net_import_without_terminal(self):
+        # Without a cross-border terminal, net import is not recorded at all,
+        # regardless of whether the series are preallocated.
+        for num_steps in (0, 2):
+            with self.subTest(num_steps=num_steps):
+                run = ScenarioRun([], [], num_steps=num_steps)
+                run.sweep()
+                run.sweep()
+                run.sweep()
+                self.assertEqual(run.net_import, [])
+
+    def test_sweep_many(self):
+        nuclear = SimpleNamespace(name="nuclear", net_generation=500)
+        battery = SimpleNamespace(name="battery", output=100)
+
+        # A single step, a couple of steps and a whole year of hourly steps, both
+        # with series grown step by step and preallocated to the full length.
+        for num_steps in (1, 2, 8760):
+            for preallocated in (False, True):
+                with self.subTest(num_steps=num_steps, preallocated=preallocated):
+                    run = ScenarioRun(
+                        power_sources=[nuclear],
+                        storage_units=[battery],
+                        num_steps=num_steps if preallocated else 0,
+                    )
+
+                    for _ in range(num_steps):
+                        run.sweep()
+
+                    self.assertEqual(run.steps, num_steps)
+                    self.assertEqual(
+                        run.get_source_generation("nuclear"), [500] * num_steps
+                    )
+                    self.assertEqual(
+                        run.get_storage_output("battery"), [100] * num_steps
+                    )
+
+    def test_compute_total_storage(self):
         run = ScenarioRun(
             power_sources=[self.nuclear, self.pv, self.peaker],
             storage_units=[self.battery]
@@ -144,9 +354,32 @@ class ScenarioRunTestCase(TestCase):
         run.sweep()
 
         self.assertEqual(run.steps, 3)
-        self.assertEqual(run.compute_total_discharging(), 5)
+        with self.subTest("charging"):
+            self.assertEqual(run.compute_total_charging(), 10)
+        with self.subTest("discharging"):
+            self.assertEqual(run.compute_total_discharging(), 5)
+
+    def test_compute_total_storage_per_unit(self):
+        battery = SimpleNamespace(name="battery", output=1e16)
+        pumped = SimpleNamespace(name="pumped", output=1.0)
+        run = ScenarioRun(power_sources=[], storage_units=[battery, pumped])
 
-    def test_count_charging_steps(self):
+        run.sweep()
+        battery.output = 0.0
+        run.sweep()
+
+        # Outputs are summed per unit, i.e. 1e16 + (1 + 1). A single pass over all
+        # outputs would lose both ones to rounding.
+        self.assertEqual(run.compute_total_discharging(), 1e16 + 2)
+
+        battery.output = -1e16
+        pumped.output = -1.0
+        run.sweep()
+        battery.output = 0.0
+        run.sweep()
+        self.assertEqual(run.compute_total_charging(), 1e16 + 2)
+
+    def test_count_storage_steps(self):
         run = ScenarioRun(
             power_sources=[self.nuclear, self.pv, self.peaker],
             storage_units=[self.battery]
@@ -162,25 +395,27 @@ class ScenarioRunTestCase(TestCase):
             run.sweep()
 
         self.assertEqual(run.steps, len(battery_output))
-        self.assertEqual(run.count_charging_steps(), 3)
+        with self.subTest("charging"):
+            self.assertEqual(run.count_charging_steps(), 3)
+        with self.subTest("discharging"):
+            self.assertEqual(run.count_discharging_steps(), 4)
+
+    def test_count_steps_multiple_units(self):
+        battery = SimpleNamespace(name="battery", output=0)
+        pumped = SimpleNamespace(name="pumped", output=0)
 
-    def test_count_discharging_steps(self):
         run = ScenarioRun(
-            power_sources=[self.nuclear, self.pv, self.peaker],
-            storage_units=[self.battery]
+            power_sources=[],
+            storage_units=[battery, pumped]
         )
 
-        battery_output = [0, 100, 50, 40, -20, -40, -100, 20]
-        self.ng_nuclear.return_value = 100
-        self.ng_pv.return_value = 50
-        self.ng_peaker.return_value = 0
-        self.out_battery.side_effect = battery_output
-
-        for _ in battery_output:
+        for battery_out, pumped_out in zip([0, -10, 5, 0, -20], [0, 30, -5, 0, -10]):
+            battery.output = battery_out
+            pumped.output = pumped_out
             run.sweep()
 
-        self.assertEqual(run.steps, len(battery_output))
-        self.assertEqual(run.count_discharging_steps(), 4)
+        self.assertEqual(run.count_charging_steps(), 3)
+        self.assertEqual(run.count_discharging_steps(), 2)
 
     def test_count_generation_steps(self):
         run = ScenarioRun(
@@ -200,3 +435,38 @@ class ScenarioRunTestCase(TestCase):
         self.assertEqual(run.count_generation_steps("nuclear"), 3)
         self.assertEqual(run.count_generation_steps("pv"), 2)
         self.assertEqual(run.count_generation_steps("peaker"), 1)
+
+
+class RunScenariosTestCase(TestCase):
+    def make_scenario(self, load):
+        return Scenario(
+            load=load,
+            baseload_sources=[NonDispatchableSource("nuclear", 100)],
+            flexible_sources=[DispatchableSource("gas", 50)],
+            intermittent_sources=[
+                (NonDispatchableSource("pv", 100), [0, 0.5, 1, 0.5]),
+            ],
+            storage_units=[EnergyStorage("battery", 20, 40)],
+        )
+
+    def test_run_scenarios(self):
+        loads = [[120, 150, 180, 250], [100, 100, 100, 100]]
+
+        runs = run_scenarios(
+            [self.make_scenario(load) for load in loads], max_workers=2
+        )
+
+        self.assertEqual(len(runs), len(loads))
+        for run, load in zip(runs, loads):
+            expected = self.make_scenario(load).run()
+            self.assertEqual(run.steps, expected.steps)
+            for name in ("nuclear", "pv", "gas"):
+                self.assertEqual(
+                    run.compute_generation(name), expected.compute_generation(name)
+                )
+            self.assertEqual(
+                run.compute_total_charging(), expected.compute_total_charging()
+            )
+            self.assertEqual(
+                run.compute_total_shortage(), expected.compute_total_shortage()
+            )
@@ -9,49 +9,54 @@ from electric_waltz.source import (
 
 
 class DispatchableTestCase(TestCase):
+    def setUp(self):
+        self.ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.2)
+
     def test_init(self):
-        ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.2)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.name, "ccgt")
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.name, "ccgt")
 
     def test_dispatch_zero(self):
-        ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.2)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.utilisation, 1)
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.utilisation, 1)
 
-        generation = ccgt.dispatch_at(0)
+        generation = self.ccgt.dispatch_at(0)
         self.assertEqual(generation, 0)
-        self.assertEqual(ccgt.generation, 0)
-        self.assertEqual(ccgt.utilisation, 0)
+        self.assertEqual(self.ccgt.generation, 0)
+        self.assertEqual(self.ccgt.utilisation, 0)
 
     def test_dispatch_midrange(self):
-        ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.2)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.utilisation, 1)
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.utilisation, 1)
 
-        generation = ccgt.dispatch_at(200)
+        generation = self.ccgt.dispatch_at(200)
         self.assertEqual(generation, 200)
-        self.assertEqual(ccgt.generation, 250)
-        self.assertEqual(ccgt.utilisation, 0.5)
+        self.assertEqual(self.ccgt.generation, 250)
+        self.assertEqual(self.ccgt.utilisation, 0.5)
 
     def test_dispatch_over_capacity(self):
-        ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.2)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.utilisation, 1)
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.utilisation, 1)
 
-        generation = ccgt.dispatch_at(999)
+        generation = self.ccgt.dispatch_at(999)
         self.assertEqual(generation, 400)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.utilisation, 1)
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.utilisation, 1)
 
     def test_shut_down(self):
-        ccgt = DispatchableSource(name="ccgt", nominal=500, self_consumption=0.1)
-        self.assertEqual(ccgt.generation, 500)
-        self.assertEqual(ccgt.utilisation, 1)
+        self.assertEqual(self.ccgt.generation, 500)
+        self.assertEqual(self.ccgt.utilisation, 1)
+
+        self.ccgt.shut_down()
+        self.assertEqual(self.ccgt.generation, 0)
+        self.assertEqual(self.ccgt.utilisation, 0)
+
+    def test_idle(self):
+        self.assertEqual(self.ccgt.net_generation, 400)
 
-        ccgt.shut_down()
-        self.assertEqual(ccgt.generation, 0)
-        self.assertEqual(ccgt.utilisation, 0)
+        self.ccgt.idle()
+        self.assertEqual(self.ccgt.net_generation, 0)
+        self.assertEqual(self.ccgt.utilisation, 0)
 
 
 class NonDispatchableTestCase(TestCase):
@@ -116,6 +121,17 @@ class PowerSourceTestCase(TestCase):
         self.assertEqual(source.generation, 900)
         self.assertEqual(source.net_generation, 810)
 
+    def test_net_generation_at(self):
+        source = PowerSource(
+            name="generic", nominal=1000, self_consumption=0.1, utilisation=1
+        )
+
+        self.assertEqual(source.net_generation_at(0.2), 180)
+        self.assertEqual(source.net_generation_at(0), 0)
+        # The source's own state is left untouched.
+        self.assertEqual(source.net_generation, 900)
+        self.assertEqual(source.utilisation, 1)
+
 
 class ThermalTestCase(TestCase):
     def setUp(self):
@@ -154,3 +170,45 @@ class ThermalTestCase(TestCase):
 
         power = self.belchatow.dispatch_at(2000)
         self.assertEqual(power, 2000)
+
+    def test_idle_within_min_uptime(self):
+        plant = ThermalPowerPlant(
+            name="dukovany", nominal=1000, min_load=0.5, min_uptime=3
+        )
+
+        power = plant.dispatch_at(800)
+        self.assertEqual(power, 800)
+
+        # The plant has to keep running at minimum load until its minimum uptime
+        # has passed.
+        plant.idle()
+        self.assertEqual(plant.net_generation, 500)
+
+        plant.idle()
+        self.assertEqual(plant.net_generation, 0)
+        self.assertTrue(plant.is_shut_down)
+
+    def test_start_up_ramp(self):
+        plant = ThermalPowerPlant(
+            name="opatovice",
+            nominal=1000,
+            self_consumption=0.07,
+            min_load=0.23,
+            startup_time=5,
+        )
+
+        # The first dispatch only initiates the start-up.
+        plant.dispatch_at(1000)
+        self.assertTrue(plant.is_starting_up)
+        self.assertEqual(plant.utilisation, 0)
+
+        # The ramp is evaluated in this exact order; these parameters give a
+        # different last digit if the expression is rearranged.
+        for phase in range(1, 6):
+            plant.dispatch_at(1000)
+            self.assertTrue(plant.is_starting_up)
+            self.assertEqual(plant.utilisation, phase / 5 * 0.23 / (1 - 0.07))
+
+        plant.dispatch_at(1000)
+        self.assertFalse(plant.is_starting_up)
+        self.assertEqual(plant.utilisation, 1)
@@ -9,116 +9,81 @@ class StorageAggregateTestCase(TestCase):
         self.assertEqual(battery.remaining_capacity, 6000)
         self.assertEqual(battery.name, "battery")
 
-    def test_charge_zero(self):
+    def test_idle(self):
         battery = EnergyStorage(name="battery", nominal=500, max_storage=2000)
-        self.assertEqual(battery.remaining_capacity, 2000)
 
-        charging_power = battery.charge_at(0)
-        self.assertEqual(battery.remaining_capacity, 2000)
-        self.assertEqual(battery.output, 0)
-        self.assertEqual(charging_power, 0)
-
-    def test_charge_from_empty(self):
-        battery = EnergyStorage(name="battery", nominal=1200, max_storage=6000)
-        self.assertEqual(battery.remaining_capacity, 6000)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 5500)
+        battery.charge_at(500)
         self.assertEqual(battery.output, -500)
-        self.assertEqual(charging_power, 500)
-
-        charging_power = battery.charge_at(1000)
-        self.assertEqual(battery.remaining_capacity, 4500)
-        self.assertEqual(battery.output, -1000)
-        self.assertEqual(charging_power, 1000)
-
-    def test_charge_when_full(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=500)
-        self.assertEqual(battery.remaining_capacity, 500)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 0)
-        self.assertEqual(charging_power, 500)
 
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 0)
-        self.assertEqual(charging_power, 0)
-
-    def test_charge_over_capacity(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=2000)
-        self.assertEqual(battery.remaining_capacity, 2000)
-
-        charging_power = battery.charge_at(1000)
+        battery.idle()
         self.assertEqual(battery.remaining_capacity, 1500)
-        self.assertEqual(charging_power, 500)
-
-        charging_power = battery.charge_at(1000)
-        self.assertEqual(battery.remaining_capacity, 1000)
-        self.assertEqual(charging_power, 500)
-
-    def test_discharge_empty(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=500)
-        self.assertEqual(battery.remaining_capacity, 500)
-
-        discharging_power = battery.discharge_at(100)
-        self.assertEqual(battery.remaining_capacity, 500)
         self.assertEqual(battery.output, 0)
-        self.assertEqual(discharging_power, 0)
-
-    def test_discharge_full(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=500)
-        self.assertEqual(battery.remaining_capacity, 500)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 0)
-        self.assertEqual(battery.output, -500)
-        self.assertEqual(charging_power, 500)
-
-        discharging_power = battery.discharge_at(500)
-        self.assertEqual(battery.remaining_capacity, 500)
-        self.assertEqual(battery.output, 500)
-        self.assertEqual(discharging_power, 500)
-
-    def test_discharge_over_capacity(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=1000)
-        self.assertEqual(battery.remaining_capacity, 1000)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 500)
-        self.assertEqual(charging_power, 500)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 0)
-        self.assertEqual(charging_power, 500)
-
-        discharging_power = battery.discharge_at(1000)
-        self.assertEqual(battery.remaining_capacity, 500)
-        self.assertEqual(discharging_power, 500)
-
-    def test_discharge_over_storage(self):
-        battery = EnergyStorage(name="battery", nominal=500, max_storage=500)
-        self.assertEqual(battery.remaining_capacity, 500)
-
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 0)
-        self.assertEqual(charging_power, 500)
-
-        discharging_power = battery.discharge_at(300)
-        self.assertEqual(battery.remaining_capacity, 300)
-        self.assertEqual(discharging_power, 300)
-
-        discharging_power = battery.discharge_at(300)
-        self.assertEqual(battery.remaining_capacity, 500)
-        self.assertEqual(discharging_power, 200)
-
-    def test_imperfect_charge_from_empty(self):
-        battery = EnergyStorage(name="battery", nominal=1000, max_storage=6000, efficiency=0.9)
-        self.assertEqual(battery.remaining_capacity, 6000)
-
-        charging_power = battery.charge_at(1000)
-        self.assertEqual(battery.remaining_capacity, 5100)
-        self.assertEqual(charging_power, 1000)
 
-        charging_power = battery.charge_at(500)
-        self.assertEqual(battery.remaining_capacity, 4650)
-        self.assertEqual(charging_power, 500)
\ No newline at end of file
+    def test_charge_discharge(self):
+        # Each case is a storage unit given as (nominal, max_storage, efficiency)
+        # and a sequence of operations given as (method, requested power,
+        # effective power, remaining capacity afterwards).
+        cases = {
+            "charge zero": (
+                (500, 2000, 1.0),
+                [("charge_at", 0, 0, 2000)],
+            ),
+            "charge from empty": (
+                (1200, 6000, 1.0),
+                [("charge_at", 500, 500, 5500), ("charge_at", 1000, 1000, 4500)],
+            ),
+            "charge when full": (
+                (500, 500, 1.0),
+                [("charge_at", 500, 500, 0), ("charge_at", 500, 0, 0)],
+            ),
+            "charge over capacity": (
+                (500, 2000, 1.0),
+                [("charge_at", 1000, 500, 1500), ("charge_at", 1000, 500, 1000)],
+            ),
+            "discharge empty": (
+                (500, 500, 1.0),
+                [("discharge_at", 100, 0, 500)],
+            ),
+            "discharge full": (
+                (500, 500, 1.0),
+                [("charge_at", 500, 500, 0), ("discharge_at", 500, 500, 500)],
+            ),
+            "discharge over capacity": (
+                (500, 1000, 1.0),
+                [
+                    ("charge_at", 500, 500, 500),
+                    ("charge_at", 500, 500, 0),
+                    ("discharge_at", 1000, 500, 500),
+                ],
+            ),
+            "discharge over storage": (
+                (500, 500, 1.0),
+                [
+                    ("charge_at", 500, 500, 0),
+                    ("discharge_at", 300, 300, 300),
+                    ("discharge_at", 300, 200, 500),
+                ],
+            ),
+            "imperfect charge from empty": (
+                (1000, 6000, 0.9),
+                [("charge_at", 1000, 1000, 5100), ("charge_at", 500, 500, 4650)],
+            ),
+        }
+
+        for case, ((nominal, max_storage, efficiency), operations) in cases.items():
+            with self.subTest(case):
+                battery = EnergyStorage(
+                    name="battery",
+                    nominal=nominal,
+                    max_storage=max_storage,
+                    efficiency=efficiency,
+                )
+                self.assertEqual(battery.remaining_capacity, max_storage)
+
+                for method, power, effective, remaining in operations:
+                    self.assertEqual(getattr(battery, method)(power), effective)
+                    self.assertEqual(battery.remaining_capacity, remaining)
+                    # Output is negative while charging, positive while
+                    # discharging.
+                    sign = -1 if method == "charge_at" else 1
+                    self.assertEqual(battery.output, sign * effective)